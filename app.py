@@ -1,10 +1,20 @@
 import streamlit as st
 import os
-import requests
-import datetime
-import json
+import re
+import glob
+import hashlib
+import logging
+import threading
+import time
+from collections import Counter
+import diskcache
+import numpy as np
+import orjson
+import pandas as pd
 from openai import OpenAI
-import json
+from monday_api import CACHE_TTL_SECONDS, ITEM_COLUMN_TYPES, MondayAPIError, load_monday_data
+
+logger = logging.getLogger(__name__)
 
 # Get API keys
 monday_api_key = os.getenv('MONDAY_API_KEY')
@@ -15,148 +25,241 @@ if not monday_api_key:
     st.error("MONDAY_API_KEY not found in environment variables. Please set it in your .env file.")
     st.stop()
 
-# Function to fetch boards from monday.com
-def get_boards():
-    url = "https://api.monday.com/v2"
-    headers = {
-        "Authorization": f"Bearer {monday_api_key}",
-        "Content-Type": "application/json"
-    }
-    query = """
-    query {
-        boards {
-            id
-            name
-        }
-    }
-    """
-    try:
-        response = requests.post(url, json={'query': query}, headers=headers)
-        response.raise_for_status()  # Raise error for bad status codes
-        data = response.json()
-        if 'errors' in data:
-            st.error(f"GraphQL Errors: {data['errors']}")
-            return []
-        return data.get('data', {}).get('boards', [])
-    except requests.exceptions.RequestException as e:
-        st.error(f"API request failed: {str(e)}")
-        return []
-
-# Function to fetch items from a specific board
-def get_board_items(board_id):
-    url = "https://api.monday.com/v2"
-    headers = {
-        "Authorization": f"Bearer {monday_api_key}",
-        "Content-Type": "application/json"
-    }
-    query = """
-    query {{
-        boards(ids: [{0}]) {{
-            items_page {{
-                items {{
-                    id
-                    name
-                    column_values {{
-                        id
-                        text
-                        value
-                    }}
-                }}
-            }}
-        }}
-    }}
-    """
+# Column text parsers, compiled once instead of per call
+PROBABILITY_MAP = {'high': 0.8, 'medium': 0.5, 'low': 0.2}
+MONEY_RE = re.compile(r'[,$]')
+DATE_FORMAT = '%Y-%m-%d'
+# Cheap shape checks so only plausible texts reach the numeric and date parsers.
+# NUMBER_RE is applied after MONEY_RE strips "," and "$", and accepts exactly the literals
+# float() does: sign, missing integer part, exponent, digit underscores, surrounding space, inf.
+_DIGITS = r'\d(?:_?\d)*'
+NUMBER_RE = re.compile(
+    r'^\s*[+-]?(?:(?:{0}(?:\.(?:{0})?)?|\.{0})(?:[eE][+-]?{0})?|inf|infinity)\s*$'.format(_DIGITS),
+    re.IGNORECASE
+)
+DATE_RE = re.compile(r'^\d{4}-\d{1,2}-\d{1,2}$')
+
+# Cleaned board frames are persisted here as Parquet, one file per board
+CLEANED_CACHE_DIR = ".cache"
+# Bump whenever build_cleaned_frame changes its output so persisted frames are rebuilt
+CLEANED_FRAME_VERSION = 3
+
+def cleaned_cache_key(raw_items):
+    # Keyed on the projected content itself: formula and mirror values change with their
+    # source items without moving the host item's updated_at, so that is not a safe shortcut
+    content = [(item['id'], item['name'], item['column_values']) for item in raw_items]
+    # The parser version and column projection decide what a frame contains, so they are keyed too
+    payload = [CLEANED_FRAME_VERSION, ITEM_COLUMN_TYPES, content]
+    return hashlib.sha256(orjson.dumps(payload)).hexdigest()
+
+# Top-level "amount" of a column value's JSON, or NaN when there is none
+def json_amount(value):
+    if not value:
+        return float('nan')
     try:
-        response = requests.post(url, json={'query': query}, headers=headers)
-        response.raise_for_status()
-        data = response.json()
-        if 'errors' in data:
-            st.error(f"GraphQL Errors: {data['errors']}")
-            return []
-        return data.get('data', {}).get('boards', [{}])[0].get('items_page', {}).get('items', [])
-    except Exception as e:
-        st.error(f"Error fetching board items: {e}")
-        return []
+        data = orjson.loads(value)
+        if isinstance(data, dict) and 'amount' in data:
+            return float(data['amount'])
+    except (ValueError, TypeError):
+        pass
+    return float('nan')
 
-def clean_data(raw_items):
-    cleaned = []
+def build_cleaned_frame(raw_items):
+    items = pd.DataFrame(raw_items, columns=['id', 'name'])
+    items['name'] = items['name'].fillna('').str.lower().str.strip()
+
+    # One row per (item, column) so every column text is parsed in a single vectorized pass
+    columns = pd.json_normalize(raw_items, 'column_values', ['id'], record_prefix='col_')
+    columns = columns.reindex(columns=['id', 'col_text', 'col_value'])
+    # Lazy %-formatting: nothing is rendered unless debug logging is enabled
+    logger.debug("Cleaning %d items with %d column values", len(items), len(columns))
+    text = columns['col_text'].fillna('').astype(str).str.strip()
+    value = columns['col_value'].fillna('').astype(str)
+
+    money_text = text.str.replace(MONEY_RE, '', regex=True)
+    numeric_text = money_text.where(money_text.str.match(NUMBER_RE))
+    date_text = text.where(text.str.match(DATE_RE))
+    # Column values repeat heavily, so each distinct JSON string is parsed once and mapped back
+    unique_values = value.unique()
+    amounts = pd.Series([json_amount(v) for v in unique_values], index=unique_values, dtype=float)
+
+    parsed = pd.DataFrame({
+        'id': columns['id'],
+        # Map probability from text
+        'probability': text.str.lower().map(PROBABILITY_MAP),
+        # Parse deal value from value (JSON) or text
+        'amount': value.map(amounts),
+        # NUMBER_RE guarantees float() succeeds, so each distinct literal is converted exactly as before
+        'text_value': numeric_text.map({s: float(s) for s in numeric_text.dropna().unique()}),
+        # Parse date from text; cache=True parses each distinct string only once
+        'date': pd.to_datetime(date_text, format=DATE_FORMAT, errors='coerce', cache=True)
+    })
+    # Later columns overwrite probability, date and JSON amount, so the last non-null parse wins;
+    # a text deal value is only taken while none is set yet, so the first one wins
+    per_item = parsed.groupby('id', sort=False).agg({
+        'probability': 'last',
+        'amount': 'last',
+        'text_value': 'first',
+        'date': 'last'
+    })
+
+    cleaned_df = items.join(per_item, on='id')
+    cleaned_df['deal_value'] = cleaned_df['amount'].fillna(cleaned_df['text_value'])
+    return cleaned_df[['id', 'name', 'deal_value', 'probability', 'date']]
+
+# Remove a board's superseded frames, plus any left over from the unversioned naming scheme
+def _prune_cleaned_frames(board_id, keep_path):
+    for path in glob.glob(os.path.join(CLEANED_CACHE_DIR, "cleaned_*.parquet")):
+        name = os.path.basename(path)
+        legacy = name.count('_') == 1
+        if path != keep_path and (legacy or name.startswith(f"cleaned_{board_id}_")):
+            try:
+                os.remove(path)
+            except OSError:
+                pass  # Already pruned by a concurrent rerun
+
+# Reload the cleaned frame from Parquet when these exact items were cleaned before.
+# Only a complete fetch is persisted (and prunes older frames), so a transient error that
+# truncates a board never replaces its good frame on disk.
+def load_cleaned_frame(raw_items, board_id, persist=True):
+    path = os.path.join(CLEANED_CACHE_DIR, f"cleaned_{board_id}_{cleaned_cache_key(raw_items)}.parquet")
+    if os.path.exists(path):
+        return pd.read_parquet(path)
+    cleaned_df = build_cleaned_frame(raw_items)
+    if not persist:
+        return cleaned_df
+    os.makedirs(CLEANED_CACHE_DIR, exist_ok=True)
+    # Write then rename so a concurrent rerun never reads a half-written file
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    cleaned_df.to_parquet(tmp_path, compression='zstd', index=False)
+    os.replace(tmp_path, path)
+    _prune_cleaned_frames(board_id, path)
+    return cleaned_df
+
+@st.cache_data(ttl=CACHE_TTL_SECONDS)
+def clean_data(raw_items, board_id, persist=True):
     data_quality_report = {
         'missing_deal_values': 0,
         'missing_probability': 0,
         'rows_excluded_invalid_dates': 0,
         'rows_excluded_invalid_numeric': 0
     }
-    
-    for item in raw_items:
-        cleaned_item = {
-            'id': item['id'],
-            'name': item['name'].lower().strip() if item['name'] else '',
-            'deal_value': None,
-            'probability': None,
-            'date': None
-        }
-        
-        for col in item['column_values']:
-            text = (col.get('text') or '').strip()
-            value = col.get('value') or ''
-            print(f"Column ID: {col['id']}, Text: {repr(text)}, Value: {repr(value)}")
-            if not text and not value:
-                continue
-            
-            # Map probability from text
-            if text.lower() == 'high':
-                cleaned_item['probability'] = 0.8
-            elif text.lower() == 'medium':
-                cleaned_item['probability'] = 0.5
-            elif text.lower() == 'low':
-                cleaned_item['probability'] = 0.2
-            
-            # Parse deal value from value (JSON) or text
-            if value:
-                try:
-                    val_data = json.loads(value)
-                    if isinstance(val_data, dict) and 'amount' in val_data:
-                        cleaned_item['deal_value'] = float(val_data['amount'])
-                except (json.JSONDecodeError, ValueError):
-                    pass
-            if cleaned_item['deal_value'] is None and text:
-                try:
-                    cleaned_item['deal_value'] = float(text.replace(',', '').replace('$', ''))
-                except ValueError:
-                    pass
-            
-            # Parse date from text
-            if text:
-                try:
-                    cleaned_item['date'] = datetime.datetime.strptime(text, '%Y-%m-%d').date()
-                except ValueError:
-                    pass
-        
-        # Check for exclusions
-        if cleaned_item['deal_value'] is None:
-            data_quality_report['rows_excluded_invalid_numeric'] += 1
-            continue  # Exclude row
-        
-        if cleaned_item['date'] is None:
-            data_quality_report['rows_excluded_invalid_dates'] += 1
-            # Note: spec says exclude if time filtering required, but for now exclude
-        
-        # Count missing in included rows
-        if cleaned_item['probability'] is None:
-            data_quality_report['missing_probability'] += 1
-        
-        cleaned.append(cleaned_item)
-    
+    if not raw_items:
+        return [], data_quality_report
+
+    cleaned_df = load_cleaned_frame(raw_items, board_id, persist)
+
+    # Check for exclusions
+    has_deal_value = cleaned_df['deal_value'].notna()
+    data_quality_report['rows_excluded_invalid_numeric'] = int((~has_deal_value).sum())
+    cleaned_df = cleaned_df[has_deal_value].copy()
+
+    # Note: spec says exclude if time filtering required, but for now only count them
+    data_quality_report['rows_excluded_invalid_dates'] = int(cleaned_df['date'].isna().sum())
+
+    # Count missing in included rows
+    data_quality_report['missing_probability'] = int(cleaned_df['probability'].isna().sum())
+
     # Since we excluded invalid deal_value, missing_deal_values is 0 for included
     data_quality_report['missing_deal_values'] = data_quality_report['rows_excluded_invalid_numeric']
-    
+
+    cleaned_df['date'] = cleaned_df['date'].dt.date
+    cleaned = cleaned_df.astype(object).where(cleaned_df.notna(), None).to_dict('records')
+
     return cleaned, data_quality_report
 
+# Questions whose embeddings are at least this similar reuse a previous LLM answer
+SEMANTIC_CACHE_THRESHOLD = 0.92
+SEMANTIC_CACHE_TTL_SECONDS = 3600
+
+class SemanticCache:
+    """In-memory store of LLM responses looked up by question embedding similarity."""
+
+    def __init__(self, threshold=SEMANTIC_CACHE_THRESHOLD, ttl=SEMANTIC_CACHE_TTL_SECONDS):
+        self.threshold = threshold
+        self.ttl = ttl
+        self.embeddings = None  # (N, dim) array of normalized question embeddings
+        self.entries = []  # (created_at, key, response) per embedding row
+        self.lock = threading.Lock()
+
+    def _evict_expired(self):
+        now = time.time()
+        keep = [i for i, (created_at, _, _) in enumerate(self.entries) if now - created_at < self.ttl]
+        if len(keep) < len(self.entries):
+            self.embeddings = self.embeddings[keep]
+            self.entries = [self.entries[i] for i in keep]
+
+    def lookup(self, embedding, key=None):
+        with self.lock:
+            self._evict_expired()
+            if not self.entries:
+                return None
+            # Embeddings are normalized, so the dot product is the cosine similarity
+            scores = self.embeddings @ embedding
+            if key is not None:
+                same_key = np.array([entry_key == key for _, entry_key, _ in self.entries])
+                scores = np.where(same_key, scores, -1.0)
+            best = int(np.argmax(scores))
+            if scores[best] >= self.threshold:
+                return self.entries[best][2]
+            return None
+
+    def store(self, embedding, response, key=None):
+        with self.lock:
+            row = embedding[np.newaxis, :]
+            self.embeddings = row if self.embeddings is None else np.vstack([self.embeddings, row])
+            self.entries.append((time.time(), key, response))
+
+@st.cache_resource
+def get_embedder():
+    # Imported here so a broken torch install only disables the semantic cache
+    from sentence_transformers import SentenceTransformer
+    return SentenceTransformer("all-MiniLM-L6-v2")
+
+@st.cache_resource
+def get_semantic_cache(name):
+    return SemanticCache()
+
+def embed_question(question):
+    return get_embedder().encode(question, normalize_embeddings=True)
+
+# The semantic cache is only an optimisation, so any failure to load the model, embed or
+# look up falls back to calling the LLM. Returns (embedding, cached response or None).
+def semantic_lookup(name, question, key=None):
+    try:
+        embedding = embed_question(question)
+        return embedding, get_semantic_cache(name).lookup(embedding, key=key)
+    except Exception:
+        logger.warning("Semantic cache lookup failed, calling the LLM directly", exc_info=True)
+        return None, None
+
+def semantic_store(name, embedding, response, key=None):
+    if embedding is None:
+        return
+    try:
+        get_semantic_cache(name).store(embedding, response, key=key)
+    except Exception:
+        logger.warning("Semantic cache store failed", exc_info=True)
+
+# Exact-match responses are persisted here so repeats survive Streamlit restarts
+LLM_CACHE_DIR = ".llm_cache"
+
+@st.cache_resource
+def get_llm_cache():
+    return diskcache.Cache(LLM_CACHE_DIR)
+
+def prompt_key(system_prompt, user_prompt, model, temperature):
+    raw = system_prompt + '\0' + user_prompt + '\0' + model + '\0' + str(temperature)
+    return hashlib.sha256(raw.encode()).hexdigest()
+
+# Built once per server process so the HTTP connection pool is reused across calls
+@st.cache_resource
+def get_openai_client():
+    if not openai_api_key:
+        return None
+    return OpenAI(api_key=openai_api_key)
+
 def extract_intent(question):
-    openai_api_key = os.getenv("OPENAI_API_KEY")
-    client = OpenAI(
-        api_key=openai_api_key
-    )
     system_prompt = """
 You are an AI assistant for a business intelligence system. Analyze the user's question and extract the intent as structured JSON.
 
@@ -178,19 +281,39 @@ If the question is unclear or missing key information, return:
 
 Do not perform any calculations. Only extract intent.
 """
+    model = "gpt-3.5-turbo-1106"
+    temperature = 0
+    llm_cache = get_llm_cache()
+    exact_key = prompt_key(system_prompt, question, model, temperature)
+    cached_content = llm_cache.get(exact_key)
+    if cached_content is not None:
+        return orjson.loads(cached_content)
+
+    embedding, cached_intent = semantic_lookup("intent", question)
+    if cached_intent is not None:
+        return cached_intent
+
+    client = get_openai_client()
+    if client is None:
+        return {"error": "OPENAI_API_KEY not found in environment variables."}
+
     try:
         response = client.chat.completions.create(
-            model="gpt-3.5-turbo",
+            model=model,
             messages=[
                 {"role": "system", "content": system_prompt},
                 {"role": "user", "content": question}
             ],
-            max_tokens=300,
-            temperature=0
+            # JSON mode constrains decoding to a single valid JSON object
+            response_format={"type": "json_object"},
+            stream=False,
+            max_tokens=150,
+            temperature=temperature
         )
-        content = response.choices[0].message.content.strip()
-        # Parse JSON
-        intent = json.loads(content)
+        content = response.choices[0].message.content
+        intent = orjson.loads(content)
+        llm_cache.set(exact_key, content)
+        semantic_store("intent", embedding, intent)
         return intent
     except Exception as e:
         if "insufficient_quota" in str(e) or "rate" in str(e).lower():
@@ -216,48 +339,57 @@ def perform_calculation(intent, cleaned_deals, cleaned_work_orders):
     def filter_data(data, sector, time_period):
         filtered = data
         if sector:
-            filtered = [item for item in filtered if item.get("sector") == sector]
+            sector_lower = sector.lower()
+            filtered = [item for item in filtered if (item.get("sector") or "").lower() == sector_lower]
         # For time_period, assume all_time for now, as date filtering is complex
         return filtered
+
+    # Filter each board once and share the result between the per-board and comparison legs
+    use_deals = board == "deals" or board == "both"
+    use_work_orders = board == "work_orders" or board == "both"
+    deals_data = filter_data(cleaned_deals, sector, time_period) if use_deals else []
+    wo_data = filter_data(cleaned_work_orders, sector, time_period) if use_work_orders else []
     
-    if board == "deals" or board == "both":
-        deals_data = filter_data(cleaned_deals, sector, time_period)
-        total_pipeline = sum(item.get("deal_value", 0) for item in deals_data)
-        weighted_pipeline = total_pipeline  # No weight available, same as total
-        stage_dist = {}
+    if use_deals:
+        # Single pass over the deals for every aggregate
+        total_pipeline = 0
+        stage_dist = Counter()
+        count_deals = 0
         for item in deals_data:
-            status = item.get("status", "Unknown")
-            stage_dist[status] = stage_dist.get(status, 0) + 1
-        count_deals = len(deals_data)
+            total_pipeline += item.get("deal_value") or 0
+            stage_dist[item.get("status", "Unknown")] += 1
+            count_deals += 1
+        weighted_pipeline = total_pipeline  # No weight available, same as total
         results["deals"] = {
             "total_pipeline_value": total_pipeline,
             "weighted_pipeline_value": weighted_pipeline,
-            "stage_distribution": stage_dist,
+            "stage_distribution": dict(stage_dist),
             "count_of_deals": count_deals
         }
     
-    if board == "work_orders" or board == "both":
-        wo_data = filter_data(cleaned_work_orders, sector, time_period)
-        total_items = len(wo_data)
-        completed = sum(1 for item in wo_data if item.get("status") == "Completed")
-        completion_rate = (completed / total_items * 100) if total_items > 0 else 0
-        billing_breakdown = {}
-        collection_breakdown = {}
+    if use_work_orders:
+        # Single pass over the work orders for every aggregate
+        total_items = 0
+        completed = 0
+        billing_breakdown = Counter()
+        collection_breakdown = Counter()
         for item in wo_data:
-            billing = item.get("billing_status", "Unknown")
-            collection = item.get("collection_status", "Unknown")
-            billing_breakdown[billing] = billing_breakdown.get(billing, 0) + 1
-            collection_breakdown[collection] = collection_breakdown.get(collection, 0) + 1
+            total_items += 1
+            if item.get("status") == "Completed":
+                completed += 1
+            billing_breakdown[item.get("billing_status", "Unknown")] += 1
+            collection_breakdown[item.get("collection_status", "Unknown")] += 1
+        completion_rate = (completed / total_items * 100) if total_items > 0 else 0
         results["work_orders"] = {
             "completion_rate": completion_rate,
-            "billing_status_breakdown": billing_breakdown,
-            "collection_status_breakdown": collection_breakdown
+            "billing_status_breakdown": dict(billing_breakdown),
+            "collection_status_breakdown": dict(collection_breakdown)
         }
     
     if board == "both":
         # Compare closed deals vs executed work_orders
-        closed_deals = sum(1 for item in cleaned_deals if item.get("status") == "Closed")
-        executed_wo = sum(1 for item in cleaned_work_orders if item.get("status") == "Completed")
+        closed_deals = sum(1 for item in deals_data if item.get("status") == "Closed")
+        executed_wo = sum(1 for item in wo_data if item.get("status") == "Completed")
         results["comparison"] = {
             "closed_deals": closed_deals,
             "executed_work_orders": executed_wo,
@@ -266,11 +398,38 @@ def perform_calculation(intent, cleaned_deals, cleaned_work_orders):
     
     return results
 
-def generate_insights(calculation_results, intent):
-    openai_api_key = os.getenv("OPENAI_API_KEY")
-    client = OpenAI(
-        api_key=openai_api_key
-    )
+# Intent shapes simple enough to summarise locally, skipping the LLM round-trip:
+# (board, analysis_type) -> (calculation results section, template)
+TRIVIAL_INSIGHT_TEMPLATES = {
+    ("deals", "pipeline"): (
+        "deals",
+        "Total pipeline is ${total_pipeline_value:,.0f} across {count_of_deals} deals. "
+        "Stage mix: {stage_distribution}."
+    ),
+    ("work_orders", "execution"): (
+        "work_orders",
+        "Work order completion rate is {completion_rate:.1f}%. "
+        "Billing status: {billing_status_breakdown}. Collection status: {collection_status_breakdown}."
+    ),
+}
+
+def render_trivial_insights(template, section):
+    # Breakdowns read as "Closed: 3, Open: 5" rather than a dict repr
+    fields = {
+        key: ", ".join(f"{label}: {count}" for label, count in value.items()) or "none"
+        if isinstance(value, dict) else value
+        for key, value in section.items()
+    }
+    return template.format(**fields)
+
+# Yields the executive summary in chunks so the UI can render tokens as they arrive
+def generate_insights(calculation_results, intent, question):
+    trivial = TRIVIAL_INSIGHT_TEMPLATES.get((intent.get("board"), intent.get("analysis_type")))
+    if trivial is not None:
+        section, template = trivial
+        yield render_trivial_insights(template, calculation_results[section])
+        return
+
     system_prompt = """
 You are an AI business analyst. Based on the provided calculation results and user intent, generate a concise executive summary in natural language.
 
@@ -278,31 +437,77 @@ The summary should be professional, insightful, and highlight key metrics, trend
 
 Keep it under 300 words.
 """
-    user_prompt = f"User intent: {json.dumps(intent)}\n\nCalculation results: {json.dumps(calculation_results)}\n\nGenerate an executive summary."
-    
+    user_prompt = f"User intent: {orjson.dumps(intent).decode()}\n\nCalculation results: {orjson.dumps(calculation_results).decode()}\n\nGenerate an executive summary."
+    model = "gpt-3.5-turbo"
+    temperature = 0.5
+    llm_cache = get_llm_cache()
+    exact_key = prompt_key(system_prompt, user_prompt, model, temperature)
+    cached_content = llm_cache.get(exact_key)
+    if cached_content is not None:
+        yield cached_content
+        return
+
+    # Only reuse a summary written for the same numbers and a similar question
+    results_key = hashlib.sha256(orjson.dumps(calculation_results, option=orjson.OPT_SORT_KEYS)).hexdigest()
+    embedding, cached_insights = semantic_lookup("insights", question, key=results_key)
+    if cached_insights is not None:
+        yield cached_insights
+        return
+
+    client = get_openai_client()
+    if client is None:
+        yield "OPENAI_API_KEY not found in environment variables. Cannot generate insights."
+        return
+
+    parts = []
     try:
-        response = client.chat.completions.create(
-            model="gpt-3.5-turbo",
+        stream = client.chat.completions.create(
+            model=model,
             messages=[
                 {"role": "system", "content": system_prompt},
                 {"role": "user", "content": user_prompt}
             ],
             max_tokens=500,
-            temperature=0.5
+            temperature=temperature,
+            stream=True
         )
-        content = response.choices[0].message.content.strip()
-        return content
+        for chunk in stream:
+            if not chunk.choices:
+                continue
+            delta = chunk.choices[0].delta.content
+            if delta:
+                parts.append(delta)
+                yield delta
+        # Only a fully streamed summary is cached
+        content = "".join(parts).strip()
+        llm_cache.set(exact_key, content)
+        semantic_store("insights", embedding, content, key=results_key)
     except Exception as e:
+        if parts:
+            # Start the error on its own paragraph rather than gluing it to the partial summary
+            yield "\n\n"
         if "insufficient_quota" in str(e) or "rate" in str(e).lower():
-            return "LLM service unavailable due to quota or rate limits. Cannot generate insights."
+            yield "LLM service unavailable due to quota or rate limits. Cannot generate insights."
         else:
-            return f"Failed to generate insights: {str(e)}"
+            yield f"Failed to generate insights: {str(e)}"
 
 # Streamlit UI
 st.title("Monday.com Business Intelligence Agent")
 st.subheader("Phase 1: Fetching Board Names")
 
-boards = get_boards()
+# Hardcoded board IDs based on fetched boards
+deals_board_id = "5026839585"  # Deals board
+work_orders_board_id = "5026840149"  # Work_Order_Tracker_Data board
+
+fetch_complete = True
+try:
+    boards, board_items = load_monday_data([deals_board_id, work_orders_board_id])
+except MondayAPIError as e:
+    # Show what did arrive; nothing was cached, so the next interaction fetches again
+    for message in e.errors:
+        st.error(message)
+    boards, board_items = e.boards, e.board_items
+    fetch_complete = False
 
 if boards:
     st.write("### Boards Found:")
@@ -313,28 +518,25 @@ else:
 
 st.subheader("Phase 2: Fetching Board Items")
 
-# Hardcoded board IDs based on fetched boards
-deals_board_id = "5026839585"  # Deals board
-work_orders_board_id = "5026840149"  # Work_Order_Tracker_Data board
+deals_items = board_items[deals_board_id]
+work_orders_items = board_items[work_orders_board_id]
 
 st.write("### Deals Board Items:")
-deals_items = get_board_items(deals_board_id)
 st.json(deals_items)
 
 st.write("### Work Orders Board Items:")
-work_orders_items = get_board_items(work_orders_board_id)
 st.json(work_orders_items)
 
 st.subheader("Phase 3: Data Cleaning")
 
 st.write("### Cleaned Deals Data:")
-cleaned_deals, report_deals = clean_data(deals_items)
+cleaned_deals, report_deals = clean_data(deals_items, deals_board_id, fetch_complete)
 st.json(cleaned_deals)
 st.write("### Data Quality Report for Deals:")
 st.json(report_deals)
 
 st.write("### Cleaned Work Orders Data:")
-cleaned_work_orders, report_work_orders = clean_data(work_orders_items)
+cleaned_work_orders, report_work_orders = clean_data(work_orders_items, work_orders_board_id, fetch_complete)
 st.json(cleaned_work_orders)
 st.write("### Data Quality Report for Work Orders:")
 st.json(report_work_orders)
@@ -364,8 +566,7 @@ if st.button("Extract Intent"):
                 
                 # Phase 6: Insight Generation
                 st.subheader("Phase 6: Insight Generation")
-                insights = generate_insights(calculation_results, intent)
                 st.write("### Executive Summary:")
-                st.write(insights)
+                st.write_stream(generate_insights(calculation_results, intent, question))
     else:
         st.warning("Please enter a question.")
\ No newline at end of file
@@ -0,0 +1,194 @@
+import streamlit as st
+import os
+import asyncio
+import aiohttp
+import orjson
+
+monday_api_key = os.getenv('MONDAY_API_KEY')
+
+MONDAY_API_URL = "https://api.monday.com/v2"
+# Pinned so the MirrorValue/FormulaValue display_value fragments below are always available
+MONDAY_API_VERSION = "2025-04"
+
+# Upper bound on each monday.com request, so a stalled connection fails instead of hanging the page
+REQUEST_TIMEOUT_SECONDS = 30
+
+class MondayGraphQLError(Exception):
+    """monday.com answered the request but reported GraphQL errors."""
+
+class MondayAPIError(Exception):
+    """A fetch failed partway; carries the error messages and whatever data was fetched.
+
+    Raised out of the cached loader so Streamlit does not memoize a failed fetch.
+    """
+
+    def __init__(self, errors, boards, board_items):
+        super().__init__("; ".join(errors))
+        self.errors = errors
+        self.boards = boards
+        self.board_items = board_items
+
+# Everything a monday.com request can fail with: transport errors, timeouts, unparseable bodies
+# and GraphQL-level errors
+MONDAY_REQUEST_ERRORS = (aiohttp.ClientError, asyncio.TimeoutError, orjson.JSONDecodeError, MondayGraphQLError)
+
+# How long fetched and cleaned board data is reused across Streamlit reruns
+CACHE_TTL_SECONDS = 300
+
+BOARDS_QUERY = """
+query {
+    boards {
+        id
+        name
+    }
+}
+"""
+
+# Column types whose text clean_data can turn into a probability, deal value or date.
+# monday.com column IDs differ per board, so the projection is done by type. Free-text types
+# stay in: imported spreadsheet boards often keep amounts and dates in text, formula or
+# mirror columns (whose display_value is mapped into text, see _with_display_text).
+# Types holding people, files, links, IDs or counters are dropped.
+ITEM_COLUMN_TYPES = ("status", "dropdown", "numbers", "date", "text", "long_text", "formula", "mirror")
+
+# Page size for items_page / next_items_page; monday.com caps this at 500
+ITEMS_PAGE_LIMIT = 500
+
+# Fields selected on every page of items, first page and follow-up pages alike
+ITEMS_PAGE_FIELDS = """
+cursor
+items {{
+    id
+    name
+    column_values(types: [{0}]) {{
+        id
+        text
+        value
+        ... on MirrorValue {{
+            display_value
+        }}
+        ... on FormulaValue {{
+            display_value
+        }}
+    }}
+}}
+""".format(", ".join(ITEM_COLUMN_TYPES))
+
+NEXT_ITEMS_PAGE_QUERY = """
+query ($cursor: String!) {{
+    next_items_page(cursor: $cursor, limit: {0}) {{
+        {1}
+    }}
+}}
+""".format(ITEMS_PAGE_LIMIT, ITEMS_PAGE_FIELDS)
+
+# Timeouts carry no message of their own, so fall back to the exception type
+def _describe_error(e):
+    return str(e) or type(e).__name__
+
+# POST a GraphQL query and return its `data` payload
+async def _post(session, query, variables=None):
+    payload = {'query': query}
+    if variables:
+        payload['variables'] = variables
+    async with session.post(MONDAY_API_URL, data=orjson.dumps(payload)) as response:
+        response.raise_for_status()  # Raise error for bad status codes
+        data = orjson.loads(await response.read())
+    if 'errors' in data:
+        raise MondayGraphQLError(f"GraphQL Errors: {data['errors']}")
+    return data.get('data') or {}
+
+# Function to fetch boards from monday.com
+async def get_boards(session, errors):
+    try:
+        data = await _post(session, BOARDS_QUERY)
+    except MONDAY_REQUEST_ERRORS as e:
+        errors.append(f"API request failed: {_describe_error(e)}")
+        return []
+    return data.get('boards', [])
+
+# Follow a board's items cursor, yielding one page of items at a time
+async def iter_next_items_pages(session, cursor):
+    while cursor:
+        data = await _post(session, NEXT_ITEMS_PAGE_QUERY, {'cursor': cursor})
+        page = data.get('next_items_page') or {}
+        yield page.get('items', [])
+        cursor = page.get('cursor')
+
+# Gather one board's remaining pages; a failure keeps the pages so far and is reported as incomplete
+# Mirror and formula columns come back with an empty `text`; their value is only in
+# display_value, so move it into `text` where clean_data reads it
+def _with_display_text(items):
+    for item in items:
+        for col in item.get('column_values') or []:
+            display_value = col.pop('display_value', None)
+            if display_value and not col.get('text'):
+                col['text'] = display_value
+    return items
+
+async def _collect_board_items(session, board_id, first_page, errors):
+    items = _with_display_text(list(first_page.get('items', [])))
+    try:
+        async for page_items in iter_next_items_pages(session, first_page.get('cursor')):
+            items.extend(_with_display_text(page_items))
+    except MONDAY_REQUEST_ERRORS as e:
+        errors.append(f"Board {board_id} items are incomplete ({len(items)} fetched): {_describe_error(e)}")
+    return items
+
+# Function to fetch items from several boards, first pages in a single request
+async def get_boards_items(session, board_ids, errors):
+    # One aliased sub-query per board so a single POST returns every board's first page
+    board_queries = "".join(
+        """
+        board_{0}: boards(ids: [{0}]) {{
+            items_page(limit: {1}) {{
+                {2}
+            }}
+        }}
+        """.format(board_id, ITEMS_PAGE_LIMIT, ITEMS_PAGE_FIELDS)
+        for board_id in board_ids
+    )
+    query = "query {{{0}}}".format(board_queries)
+    try:
+        data = await _post(session, query)
+    except MONDAY_REQUEST_ERRORS as e:
+        errors.append(f"Error fetching board items: {_describe_error(e)}")
+        return {board_id: [] for board_id in board_ids}
+    first_pages = [
+        (data.get(f"board_{board_id}") or [{}])[0].get('items_page') or {}
+        for board_id in board_ids
+    ]
+    # Boards with more than one page follow their cursors concurrently, each handling its own errors
+    board_items = await asyncio.gather(
+        *(_collect_board_items(session, board_id, first_page, errors)
+          for board_id, first_page in zip(board_ids, first_pages))
+    )
+    return dict(zip(board_ids, board_items))
+
+# Open a keep-alive session that carries the monday.com auth headers for every request
+def _monday_session():
+    headers = {
+        "Authorization": f"Bearer {monday_api_key}",
+        "Content-Type": "application/json",
+        "API-Version": MONDAY_API_VERSION
+    }
+    connector = aiohttp.TCPConnector(limit_per_host=4, keepalive_timeout=60)
+    timeout = aiohttp.ClientTimeout(total=REQUEST_TIMEOUT_SECONDS)
+    return aiohttp.ClientSession(headers=headers, connector=connector, timeout=timeout)
+
+# Fetch the board list and the board items concurrently over one client session
+async def fetch_all(board_ids):
+    errors = []
+    async with _monday_session() as session:
+        boards, board_items = await asyncio.gather(
+            get_boards(session, errors),
+            get_boards_items(session, board_ids, errors)
+        )
+    if errors:
+        raise MondayAPIError(errors, boards, board_items)
+    return boards, board_items
+
+# Only complete fetches are cached: a MondayAPIError propagates, so the next rerun retries
+@st.cache_data(ttl=CACHE_TTL_SECONDS)
+def load_monday_data(board_ids):
+    return asyncio.run(fetch_all(board_ids))